@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import argparse
+import logging
+from logging.handlers import RotatingFileHandler
 from source.hand_gesture_app import HandGestureApp
 
 def get_args():
@@ -10,10 +12,17 @@ def get_args():
     parser.add_argument("--height", help='cap height', type=int, default=540)
     parser.add_argument('--use_static_image_mode', action='store_true')
     parser.add_argument("--min_detection_confidence", type=float, default=0.7)
-    parser.add_argument("--min_tracking_confidence", type=int, default=0.5)
+    parser.add_argument("--min_tracking_confidence", type=float, default=0.5)
+    parser.add_argument("--log_level", default="WARNING")
     return parser.parse_args()
 
+def setup_logging(level):
+    handler = RotatingFileHandler('hand_gesture_app.log', maxBytes=1_000_000, backupCount=3)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    logging.basicConfig(level=level.upper(), handlers=[handler, logging.StreamHandler()])
+
 if __name__ == '__main__':
     args = get_args()
+    setup_logging(args.log_level)
     app = HandGestureApp(args)
     app.gui.root.mainloop()
\ No newline at end of file
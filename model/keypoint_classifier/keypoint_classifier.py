@@ -1,30 +1,47 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import numpy as np
-import tensorflow as tf
+
+try:
+    # Standalone runtime: smaller import, XNNPACK delegate applied by default
+    from tflite_runtime.interpreter import Interpreter
+except ImportError:
+    import tensorflow as tf
+    Interpreter = tf.lite.Interpreter
 
 
 class KeyPointClassifier(object):
     def __init__(
         self,
-        model_path='model/keypoint_classifier/keypoint_classifier.tflite',
+        model_path='model/keypoint_classifier/keypoint_classifier_int8.tflite',
         num_threads=1,
     ):
-        self.interpreter = tf.lite.Interpreter(model_path=model_path,
-                                               num_threads=num_threads)
+        self.interpreter = Interpreter(model_path=model_path,
+                                       num_threads=num_threads)
 
         self.interpreter.allocate_tensors()
         self.input_details = self.interpreter.get_input_details()
         self.output_details = self.interpreter.get_output_details()
 
+        # Quantized (int8) models take integer input; scale is 0.0 for float models
+        self.input_dtype = self.input_details[0]['dtype']
+        self.input_scale, self.input_zero_point = self.input_details[0]['quantization']
+        if self.input_scale:
+            self.input_min = np.iinfo(self.input_dtype).min
+            self.input_max = np.iinfo(self.input_dtype).max
+
     def __call__(
         self,
         landmark_list,
     ):
         input_details_tensor_index = self.input_details[0]['index']
+        input_array = np.asarray(landmark_list, dtype=np.float32)
+        if self.input_scale:
+            input_array = np.clip(np.round(input_array / self.input_scale + self.input_zero_point),
+                                  self.input_min, self.input_max).astype(self.input_dtype)
         self.interpreter.set_tensor(
             input_details_tensor_index,
-            np.array([landmark_list], dtype=np.float32))
+            input_array[None, :])
         self.interpreter.invoke()
 
         output_details_tensor_index = self.output_details[0]['index']
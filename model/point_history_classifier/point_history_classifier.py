@@ -1,7 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import numpy as np
-import tensorflow as tf
+
+try:
+    # Standalone runtime: smaller import, XNNPACK delegate applied by default
+    from tflite_runtime.interpreter import Interpreter
+except ImportError:
+    import tensorflow as tf
+    Interpreter = tf.lite.Interpreter
 
 
 class PointHistoryClassifier(object):
@@ -12,13 +18,21 @@ class PointHistoryClassifier(object):
         invalid_value=0,
         num_threads=1,
     ):
-        self.interpreter = tf.lite.Interpreter(model_path=model_path,
-                                               num_threads=num_threads)
+        self.interpreter = Interpreter(model_path=model_path,
+                                       num_threads=num_threads)
 
         self.interpreter.allocate_tensors()
         self.input_details = self.interpreter.get_input_details()
         self.output_details = self.interpreter.get_output_details()
 
+        # Quantized (int8) models take integer input; scale is 0.0 for float models
+        self.input_dtype = self.input_details[0]['dtype']
+        self.input_scale, self.input_zero_point = self.input_details[0]['quantization']
+        if self.input_scale:
+            self.input_min = np.iinfo(self.input_dtype).min
+            self.input_max = np.iinfo(self.input_dtype).max
+        self.output_scale, self.output_zero_point = self.output_details[0]['quantization']
+
         self.score_th = score_th
         self.invalid_value = invalid_value
 
@@ -27,9 +41,13 @@ class PointHistoryClassifier(object):
         point_history,
     ):
         input_details_tensor_index = self.input_details[0]['index']
+        input_array = np.asarray(point_history, dtype=np.float32)
+        if self.input_scale:
+            input_array = np.clip(np.round(input_array / self.input_scale + self.input_zero_point),
+                                  self.input_min, self.input_max).astype(self.input_dtype)
         self.interpreter.set_tensor(
             input_details_tensor_index,
-            np.array([point_history], dtype=np.float32))
+            input_array[None, :])
         self.interpreter.invoke()
 
         output_details_tensor_index = self.output_details[0]['index']
@@ -38,7 +56,11 @@ class PointHistoryClassifier(object):
 
         result_index = np.argmax(np.squeeze(result))
 
-        if np.squeeze(result)[result_index] < self.score_th:
+        score = np.squeeze(result)[result_index]
+        if self.output_scale:
+            score = (float(score) - self.output_zero_point) * self.output_scale
+
+        if score < self.score_th:
             result_index = self.invalid_value
 
         return result_index
@@ -0,0 +1,38 @@
+import socket
+from typing import List
+
+class DashboardPipeline:
+    """UR Dashboard server client that sends several commands per round trip"""
+    PORT = 29999
+
+    def __init__(self, host: str, timeout: float = 2.0):
+        self.host = host
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+
+    def connect(self):
+        """Open the connection and consume the server's welcome line"""
+        self._sock = socket.create_connection((self.host, self.PORT), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile('rb')
+        self._read_reply()
+
+    def send(self, *commands: str) -> List[str]:
+        """Send commands in one write, then read one reply line per command"""
+        self._sock.sendall(''.join(command + '\n' for command in commands).encode())
+        return [self._read_reply() for _ in commands]
+
+    def _read_reply(self) -> str:
+        """Read one newline-terminated reply"""
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Dashboard server closed the connection")
+        return line.decode(errors='replace').strip()
+
+    def disconnect(self):
+        """Close the connection"""
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = self._reader = None
@@ -1,5 +1,6 @@
 import time
-from enum import Enum
+from collections import deque
+from enum import Enum, IntEnum
 
 class FSMState(Enum):
     DISABLED = 1
@@ -7,6 +8,16 @@ class FSMState(Enum):
     AWAIT_CONFIRM = 3
     RUNNING = 4
 
+class StaticGesture(IntEnum):
+    NONE = 0
+    OPEN = 1
+    CLOSE = 2
+
+class DynamicGesture(IntEnum):
+    NONE = 0
+    CW = 1
+    CCW = 2
+
 class FSMController:
     def __init__(self):
         self.state = FSMState.DISABLED
@@ -28,20 +39,27 @@ class FSMController:
         self.running_since = None
         self.pending_selection = None
         
-        self.log_messages = []
+        self.log_messages = deque(maxlen=256)
+        
+        # State handlers, all called as (static_gesture, dynamic_gesture, now, robot_controller, log_messages)
+        self._dispatch = {
+            FSMState.DISABLED: self._handle_disabled_state,
+            FSMState.ENABLED: self._handle_enabled_state,
+            FSMState.AWAIT_CONFIRM: self._handle_await_confirm_state,
+            FSMState.RUNNING: self._handle_running_state,
+        }
 
     def update(self, static_gesture, dynamic_gesture, robot_controller):
         """Update FSM state based on current gestures"""
-        now = time.time()
-        new_log_messages = []
+        now = time.monotonic()
         
         # Handle stop gesture (Close hand)
-        if static_gesture == 'Close':
+        if static_gesture == StaticGesture.CLOSE:
             if self.stop_hold_since is None:
                 self.stop_hold_since = now
             if now - self.stop_hold_since >= self.STOP_HOLD_TIME:
                 if self.state != FSMState.DISABLED:
-                    new_log_messages.append(f"STOP >= {self.STOP_HOLD_TIME:.1f}s -> DESABILITADO")
+                    self.log_messages.append(f"STOP >= {self.STOP_HOLD_TIME:.1f}s -> DESABILITADO")
                     robot_controller.set_enabled(False)
                     self._transition_to(FSMState.DISABLED, now)
                 self.stop_hold_since = None
@@ -49,35 +67,27 @@ class FSMController:
             self.stop_hold_since = None
 
         # State machine logic 
-        if self.state == FSMState.DISABLED:
-            self._handle_disabled_state(static_gesture, now, robot_controller, new_log_messages)
-            
-        elif self.state == FSMState.ENABLED:
-            self._handle_enabled_state(dynamic_gesture, now, new_log_messages)
-            
-        elif self.state == FSMState.AWAIT_CONFIRM:
-            self._handle_await_confirm_state(dynamic_gesture, now, robot_controller, new_log_messages)
-            
-        elif self.state == FSMState.RUNNING:
-            self._handle_running_state(now, robot_controller, new_log_messages)
-        
-        self.log_messages.extend(new_log_messages)
+        self._dispatch[self.state](static_gesture, dynamic_gesture, now, robot_controller, self.log_messages)
 
-    def _handle_disabled_state(self, static_gesture, now, robot_controller, log_messages):
+    def _handle_disabled_state(self, static_gesture, dynamic_gesture, now, robot_controller, log_messages):
         """Handle DISABLED state transitions"""
-        if static_gesture == 'Open':
+        if static_gesture == StaticGesture.OPEN:
             if self.start_hold_since is None:
                 self.start_hold_since = now
             elif now - self.start_hold_since >= self.START_HOLD_TIME:
-                log_messages.append(f"START >= {self.START_HOLD_TIME:.1f}s -> HABILITADO")
-                robot_controller.set_enabled(True)
-                self._transition_to(FSMState.ENABLED, now)
+                if robot_controller.set_enabled(True):
+                    log_messages.append(f"START >= {self.START_HOLD_TIME:.1f}s -> HABILITADO")
+                    self._transition_to(FSMState.ENABLED, now)
+                else:
+                    # Retried once the gesture is held again
+                    log_messages.append("Erro ao habilitar o robô. Permanecendo DESABILITADO.")
+                    self.start_hold_since = None
         else:
             self.start_hold_since = None
 
-    def _handle_enabled_state(self, dynamic_gesture, now, log_messages):
+    def _handle_enabled_state(self, static_gesture, dynamic_gesture, now, robot_controller, log_messages):
         """Handle ENABLED state transitions"""
-        if dynamic_gesture in ['CW', 'CCW']:
+        if dynamic_gesture != DynamicGesture.NONE:
             if self.pending_selection == dynamic_gesture:
                 self.gesture_counter += 1
             else:
@@ -87,13 +97,13 @@ class FSMController:
             if self.gesture_counter >= self.GESTURE_CONFIRM_COUNT:
                 self.awaiting_confirm_since = now
                 self._transition_to(FSMState.AWAIT_CONFIRM, now)
-                log_messages.append(f"Seleção inicial '{self.pending_selection}' -> Aguardando confirmação.")
+                log_messages.append(f"Seleção inicial '{self.pending_selection.name}' -> Aguardando confirmação.")
                 self.gesture_counter = 0  
         else:
             self.pending_selection = None
             self.gesture_counter = 0
 
-    def _handle_await_confirm_state(self, dynamic_gesture, now, robot_controller, log_messages):
+    def _handle_await_confirm_state(self, static_gesture, dynamic_gesture, now, robot_controller, log_messages):
         """Handle AWAIT_CONFIRM state transition"""
         if dynamic_gesture == self.pending_selection:
             self.confirm_counter += 1  
@@ -101,25 +111,35 @@ class FSMController:
             self.confirm_counter = 0  
         
         if self.confirm_counter >= self.GESTURE_CONFIRM_COUNT:
-            is_prog2 = (self.pending_selection == 'CCW')
-            robot_controller.set_program_selection(is_prog2)
-            
-            log_messages.append(f"Seleção '{self.pending_selection}' confirmada. Executando.")
+            is_prog2 = (self.pending_selection == DynamicGesture.CCW)
+            # ur_rtde writes one output per call, so DO5 is set before the DO6 pulse
+            selected = robot_controller.set_program_selection(is_prog2)
             
-            try:
-                robot_controller.pulse_execute(self.EXEC_PULSE_TIME)
-            except Exception as e:
-                log_messages.append(f"Erro ao executar pulso: {e}")
+            # Selection is released once the pulse ends, without blocking the FSM
+            pulsing = False
+            if selected:
+                try:
+                    pulsing = robot_controller.pulse_execute(
+                        self.EXEC_PULSE_TIME,
+                        on_release=lambda: robot_controller.set_program_selection(False)
+                    )
+                except Exception as e:
+                    log_messages.append(f"Erro ao executar pulso: {e}")
             
-            robot_controller.set_program_selection(False)
-            self._transition_to(FSMState.RUNNING, now)
+            if pulsing:
+                log_messages.append(f"Seleção '{self.pending_selection.name}' confirmada. Executando.")
+                self._transition_to(FSMState.RUNNING, now)
+            else:
+                robot_controller.set_program_selection(False)
+                log_messages.append(f"Erro ao executar '{self.pending_selection.name}'. Retornando para HABILITADO.")
+                self._transition_to(FSMState.ENABLED, now)
             self.confirm_counter = 0 
         
         elif self.awaiting_confirm_since and (now - self.awaiting_confirm_since > self.CONFIRM_TIMEOUT):
             log_messages.append("Timeout de confirmação. Retornando para HABILITADO.")
             self._transition_to(FSMState.ENABLED, now)
 
-    def _handle_running_state(self, now, robot_controller, log_messages):
+    def _handle_running_state(self, static_gesture, dynamic_gesture, now, robot_controller, log_messages):
         """Handle RUNNING state transitions"""
         try:
             program_finished = robot_controller.get_program_finished()
@@ -167,6 +187,6 @@ class FSMController:
 
     def get_log_messages(self):
         """Get accumulated log messages and clear buffer"""
-        messages = self.log_messages.copy()
+        messages = list(self.log_messages)
         self.log_messages.clear()
         return messages
\ No newline at end of file
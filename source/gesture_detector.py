@@ -1,9 +1,6 @@
 import csv
-import copy
-import itertools
 import cv2 as cv
 import numpy as np
-from collections import Counter
 from collections import deque
 
 import mediapipe as mp
@@ -12,11 +9,57 @@ from utils import CvFpsCalc
 from model import KeyPointClassifier
 from model import PointHistoryClassifier
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Run the kernels as plain NumPy code when Numba is not installed"""
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def _normalize_landmarks(xy, out):
+    """Make points relative to the first one and scale them into [-1, 1]"""
+    out[:] = (xy - xy[0]).ravel()
+    out /= np.abs(out).max()
+
+
+@njit(cache=True, fastmath=True)
+def _normalize_point_history(xy, width, height, out):
+    """Make points relative to the first one and scale them by the frame size"""
+    out[0::2] = (xy[:, 0] - xy[0, 0]) / width
+    out[1::2] = (xy[:, 1] - xy[0, 1]) / height
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from cache) at import instead of on the first frame
+    _normalize_landmarks(np.arange(42, dtype=np.int32).reshape(21, 2), np.zeros(42, dtype=np.float32))
+    _normalize_point_history(np.zeros((16, 2), dtype=np.int32), 1, 1, np.zeros(32, dtype=np.float32))
+
 class GestureDetector:
+    # Landmark index chains drawn as polylines
+    _HAND_POLYLINES = (
+        np.array([2, 3, 4]),                    # Thumb
+        np.array([5, 6, 7, 8]),                 # Index finger
+        np.array([9, 10, 11, 12]),              # Middle finger
+        np.array([13, 14, 15, 16]),             # Ring finger
+        np.array([17, 18, 19, 20]),             # Little finger
+        np.array([0, 1, 2, 5, 9, 13, 17, 0]),   # Palm
+    )
+    # Fingertips are drawn larger than the other key points
+    _LANDMARK_RADII = tuple(8 if index in (4, 8, 12, 16, 20) else 5 for index in range(21))
+    # Height and width of the cached FPS overlay tile
+    _FPS_SPRITE_SIZE = (40, 180)
+
     def __init__(self, args):
         self.args = args
         
-        # MediaPipe hands
+        # MediaPipe hands (outside static image mode, palm detection only reruns
+        # when landmark tracking from the previous frame drops below
+        # min_tracking_confidence)
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
             static_image_mode=args.use_static_image_mode,
@@ -37,143 +80,127 @@ class GestureDetector:
             'model/point_history_classifier/point_history_classifier_label.csv'
         )
         
-        # FPS calculator
+        # Label ids compared against on every frame
+        self.pointer_id = self.keypoint_classifier_labels.index('Pointer')
+        self.open_id = self.keypoint_classifier_labels.index('Open')
+        self.close_id = self.keypoint_classifier_labels.index('Close')
+        self.cw_id = self.point_history_classifier_labels.index('Clockwise')
+        self.ccw_id = self.point_history_classifier_labels.index('Counter Clockwise')
+        
+        self._n_kp = len(self.keypoint_classifier_labels)
+        self._n_ph = len(self.point_history_classifier_labels)
+        
+        # FPS calculator and rendered FPS overlays, keyed by FPS value
         self.cvFpsCalc = CvFpsCalc(buffer_len=10)
+        self._fps_sprites = {}
+
+        # Frame size used to scale landmarks, updated once the camera is open
+        self.set_frame_size(args.width, args.height)
+
+        # Classifier input buffers, reused every frame
+        self.history_length = 16
+        self._kp_buf = np.zeros(21 * 2, dtype=np.float32)
+        self._ph_buf = np.zeros(self.history_length * 2, dtype=np.float32)
+
+        # Finger gesture history and a rolling histogram of its ids
+        self.finger_gesture_history = deque(maxlen=self.history_length)
+        self._fg_counts = np.zeros(self._n_ph, dtype=np.int32)
 
     def _load_labels(self, filepath):
         """Load classifier labels from CSV"""
         with open(filepath, encoding='utf-8-sig') as f:
             return [row[0] for row in csv.reader(f)]
 
-    def process_frame(self, image):
-        """Process frame with MediaPipe"""
-        image_rgb = cv.cvtColor(image, cv.COLOR_BGR2RGB)
-        return self.hands.process(image_rgb)
-
-    def calc_bounding_rect(self, image, landmarks):
-        """Calculate bounding rectangle for hand"""
-        image_width, image_height = image.shape[1], image.shape[0]
-        landmark_array = np.empty((0, 2), int)
-        
-        for _, landmark in enumerate(landmarks.landmark):
-            landmark_x = min(int(landmark.x * image_width), image_width - 1)
-            landmark_y = min(int(landmark.y * image_height), image_height - 1)
-            landmark_point = [np.array((landmark_x, landmark_y))]
-            landmark_array = np.append(landmark_array, landmark_point, axis=0)
-            
-        x, y, w, h = cv.boundingRect(landmark_array)
-        return [x, y, x + w, y + h]
-
-    def calc_landmark_list(self, image, landmarks):
-        """Calculate landmark coordinates"""
-        image_width, image_height = image.shape[1], image.shape[0]
-        landmark_point = []
-        
-        for _, landmark in enumerate(landmarks.landmark):
-            landmark_x = min(int(landmark.x * image_width), image_width - 1)
-            landmark_y = min(int(landmark.y * image_height), image_height - 1)
-            landmark_point.append([landmark_x, landmark_y])
-            
-        return landmark_point
+    def set_frame_size(self, width, height):
+        """Set the size of the frames passed to process_frame"""
+        self._w, self._h = width, height
+
+    def process_frame(self, image_rgb):
+        """Process RGB frame with MediaPipe"""
+        # Read-only input lets MediaPipe wrap the buffer instead of copying it
+        image_rgb.flags.writeable = False
+        results = self.hands.process(image_rgb)
+        image_rgb.flags.writeable = True
+        return results
+
+    def calc_landmarks_and_rect(self, landmarks):
+        """Calculate landmark coordinates and bounding rectangle for hand"""
+        image_width, image_height = self._w, self._h
+        landmark = landmarks.landmark
+        xs = (np.fromiter((p.x for p in landmark), dtype=np.float32, count=len(landmark)) * image_width).astype(np.int32)
+        ys = (np.fromiter((p.y for p in landmark), dtype=np.float32, count=len(landmark)) * image_height).astype(np.int32)
+        np.minimum(xs, image_width - 1, out=xs)
+        np.minimum(ys, image_height - 1, out=ys)
+
+        landmark_point = np.stack((xs, ys), axis=1)
+        brect = [int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max())]
+        return landmark_point, brect
 
     def pre_process_landmark(self, landmark_list):
         """Pre-process landmarks for classification"""
-        temp_landmark_list = copy.deepcopy(landmark_list)
-        base_x, base_y = 0, 0
-        
-        for index, landmark_point in enumerate(temp_landmark_list):
-            if index == 0:
-                base_x, base_y = landmark_point[0], landmark_point[1]
-            temp_landmark_list[index][0] -= base_x
-            temp_landmark_list[index][1] -= base_y
-            
-        temp_landmark_list = list(itertools.chain.from_iterable(temp_landmark_list))
-        max_value = max(list(map(abs, temp_landmark_list)))
-        
-        def normalize_(n):
-            return n / max_value
-            
-        return list(map(normalize_, temp_landmark_list))
+        _normalize_landmarks(np.asarray(landmark_list, dtype=np.int32), self._kp_buf)
+        return self._kp_buf
 
-    def pre_process_point_history(self, image, point_history):
+    def pre_process_point_history(self, point_history):
         """Pre-process point history for classification"""
-        image_width, image_height = image.shape[1], image.shape[0]
-        temp_point_history = copy.deepcopy(point_history)
-        base_x, base_y = 0, 0
-        
-        for index, point in enumerate(temp_point_history):
-            if index == 0:
-                base_x, base_y = point[0], point[1]
-            temp_point_history[index][0] = (temp_point_history[index][0] - base_x) / image_width
-            temp_point_history[index][1] = (temp_point_history[index][1] - base_y) / image_height
-            
-        return list(itertools.chain.from_iterable(temp_point_history))
+        point_array = np.asarray(point_history, dtype=np.int32)
+        out = self._ph_buf[:point_array.size]
+        _normalize_point_history(point_array, self._w, self._h, out)
+        return out
 
     def classify_static_gesture(self, landmark_list):
         """Classify static hand gesture"""
         pre_processed_landmark_list = self.pre_process_landmark(landmark_list)
         return self.keypoint_classifier(pre_processed_landmark_list)
 
-    def classify_dynamic_gesture(self, image, point_history, history_length):
+    def classify_dynamic_gesture(self, point_history):
         """Classify dynamic hand gesture"""
-        pre_processed_point_history_list = self.pre_process_point_history(image, point_history)
-        point_history_len = len(pre_processed_point_history_list)
-        
-        if point_history_len == (history_length * 2):
+        if len(point_history) == self.history_length:
+            pre_processed_point_history_list = self.pre_process_point_history(point_history)
             return self.point_history_classifier(pre_processed_point_history_list)
         return 0
 
     def get_static_gesture_label(self, hand_sign_id):
         """Get static gesture label"""
-        if hand_sign_id < len(self.keypoint_classifier_labels):
+        if hand_sign_id < self._n_kp:
             return self.keypoint_classifier_labels[hand_sign_id]
         return ""
 
-    def get_dynamic_gesture_label(self, finger_gesture_history):
+    def update_finger_gesture_history(self, finger_gesture_id):
+        """Append finger gesture id, keeping the rolling histogram in sync"""
+        history = self.finger_gesture_history
+        if len(history) == history.maxlen:
+            self._fg_counts[history[0]] -= 1
+        history.append(finger_gesture_id)
+        self._fg_counts[finger_gesture_id] += 1
+
+    def get_dynamic_gesture_id(self):
+        """Get most common finger gesture id in the history"""
+        return int(self._fg_counts.argmax())
+
+    def get_dynamic_gesture_label(self, finger_gesture_id):
         """Get dynamic gesture label"""
-        if finger_gesture_history:
-            most_common_fg_id = Counter(finger_gesture_history).most_common()
-            if most_common_fg_id and most_common_fg_id[0][0] < len(self.point_history_classifier_labels):
-                return self.point_history_classifier_labels[most_common_fg_id[0][0]]
+        if self.finger_gesture_history and finger_gesture_id < self._n_ph:
+            return self.point_history_classifier_labels[finger_gesture_id]
         return ""
 
     def draw_landmarks(self, image, landmark_point):
         """Draw hand landmarks on image"""
         if len(landmark_point) > 0:
-            # Thumb
-            self._draw_finger_segment(image, landmark_point, 2, 4)
-            # Index finger
-            self._draw_finger_segment(image, landmark_point, 5, 8)
-            # Middle finger
-            self._draw_finger_segment(image, landmark_point, 9, 12)
-            # Ring finger
-            self._draw_finger_segment(image, landmark_point, 13, 16)
-            # Little finger
-            self._draw_finger_segment(image, landmark_point, 17, 20)
-            # Palm
-            self._draw_palm_segments(image, landmark_point)
+            landmark_point = np.asarray(landmark_point, dtype=np.int32)
+            
+            # Fingers and palm
+            polylines = [landmark_point[indices] for indices in self._HAND_POLYLINES]
+            cv.polylines(image, polylines, False, (0, 0, 0), 6)
+            cv.polylines(image, polylines, False, (255, 255, 255), 2)
             
             # Key Points
-            for index, landmark in enumerate(landmark_point):
-                radius = 8 if index in [4, 8, 12, 16, 20] else 5
-                cv.circle(image, (landmark[0], landmark[1]), radius, (255, 255, 255), -1)
-                cv.circle(image, (landmark[0], landmark[1]), radius, (0, 0, 0), 1)
+            for (x, y), radius in zip(landmark_point.tolist(), self._LANDMARK_RADII):
+                cv.circle(image, (x, y), radius, (255, 255, 255), -1)
+                cv.circle(image, (x, y), radius, (0, 0, 0), 1)
                 
         return image
 
-    def _draw_finger_segment(self, image, landmarks, start_idx, end_idx):
-        """Draw finger segments"""
-        for i in range(start_idx, end_idx):
-            cv.line(image, tuple(landmarks[i]), tuple(landmarks[i+1]), (0, 0, 0), 6)
-            cv.line(image, tuple(landmarks[i]), tuple(landmarks[i+1]), (255, 255, 255), 2)
-
-    def _draw_palm_segments(self, image, landmarks):
-        """Draw palm connecting segments"""
-        connections = [(0,1), (1,2), (2,5), (5,9), (9,13), (13,17), (17,0)]
-        for start_idx, end_idx in connections:
-            cv.line(image, tuple(landmarks[start_idx]), tuple(landmarks[end_idx]), (0, 0, 0), 6)
-            cv.line(image, tuple(landmarks[start_idx]), tuple(landmarks[end_idx]), (255, 255, 255), 2)
-
     def draw_info_text(self, image, brect, handedness, hand_sign_text, finger_gesture_text):
         """Draw information text on image"""
         cv.rectangle(image, (brect[0], brect[1]), (brect[2], brect[1] - 22), (0, 0, 0), -1)
@@ -200,6 +227,28 @@ class GestureDetector:
 
     def draw_info(self, image, fps):
         """Draw FPS information"""
-        cv.putText(image, "FPS:" + str(fps), (10, 30), cv.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 4, cv.LINE_AA)
-        cv.putText(image, "FPS:" + str(fps), (10, 30), cv.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2, cv.LINE_AA)
-        return image
\ No newline at end of file
+        sprite = self._fps_sprites.get(fps)
+        if sprite is None:
+            sprite = self._fps_sprites[fps] = self._render_fps_sprite(fps)
+        inv_alpha, overlay = sprite
+        roi = image[:inv_alpha.shape[0], :inv_alpha.shape[1]]
+        roi[:] = roi * inv_alpha + overlay
+        return image
+
+    def _render_fps_sprite(self, fps):
+        """Rasterize the FPS text once as a blend factor and a premultiplied overlay"""
+        text = "FPS:" + str(fps)
+        halo = np.zeros(self._FPS_SPRITE_SIZE, dtype=np.uint8)
+        fill = np.zeros(self._FPS_SPRITE_SIZE + (3,), dtype=np.uint8)
+        cv.putText(halo, text, (10, 30), cv.FONT_HERSHEY_SIMPLEX, 1.0, 255, 4, cv.LINE_AA)
+        cv.putText(fill, text, (10, 30), cv.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2, cv.LINE_AA)
+        
+        # Crop to the text so only touched pixels are blended
+        rows, cols = np.nonzero(halo)
+        halo = halo[:rows.max() + 1, :cols.max() + 1]
+        fill = fill[:rows.max() + 1, :cols.max() + 1]
+        
+        # Black halo under white fill: out = image * (1 - halo) * (1 - fill) + 255 * fill
+        halo_alpha = halo[..., None].astype(np.float32) / 255
+        fill_alpha = fill.astype(np.float32) / 255
+        return (1 - halo_alpha) * (1 - fill_alpha), fill.astype(np.float32)
\ No newline at end of file
@@ -1,14 +1,17 @@
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
 import time
+from collections import deque
 
 class GUIInterface:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Controle de Robô por Gestos")
         self._setup_gui()
-        self.log_messages = []
+        self.log_messages = deque(maxlen=256)
+        self.video_image = None
+        self._last_ts_second = None
+        self._last_ts_text = ""
 
     def _setup_gui(self):
         """Setup the GUI layout"""
@@ -87,13 +90,21 @@ class GUIInterface:
 
     def log_message(self, message):
         """Add message to log"""
-        timestamp = time.strftime("%H:%M:%S")
+        timestamp = self._timestamp()
         self.log_text.config(state="normal")
         self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
         self.log_text.see(tk.END)
         self.log_text.config(state="disabled")
         self.log_messages.append(f"[{timestamp}] {message}")
 
+    def _timestamp(self):
+        """Get wall-clock time as HH:MM:SS, formatted at most once per second"""
+        now_second = int(time.time())
+        if now_second != self._last_ts_second:
+            self._last_ts_second = now_second
+            self._last_ts_text = time.strftime("%H:%M:%S", time.localtime(now_second))
+        return self._last_ts_text
+
     def update_display(self, image, state, static_gesture, dynamic_gesture, pending_selection, log_messages):
         """Update the GUI display"""
         # Update status variables
@@ -102,16 +113,18 @@ class GUIInterface:
         self.status_vars["Gesto Dinâmico"].set(dynamic_gesture if dynamic_gesture else "N/A")
         self.status_vars["Seleção Pendente"].set(pending_selection if pending_selection else "N/A")
         
-        # Update video feed
-        img = Image.fromarray(image)
-        imgtk = ImageTk.PhotoImage(image=img)
-        self.video_label.imgtk = imgtk
-        self.video_label.configure(image=imgtk)
+        # Update video feed (RGB frame wrapped as PPM, loaded into a single PhotoImage)
+        height, width = image.shape[:2]
+        ppm_data = b'P6 %d %d 255 ' % (width, height) + image.tobytes()
+        if self.video_image is None:
+            self.video_image = tk.PhotoImage(data=ppm_data, format='PPM')
+            self.video_label.configure(image=self.video_image)
+        else:
+            self.video_image.configure(data=ppm_data, format='PPM')
         
-        # Update log messages
+        # Update log messages (the FSM hands out each message only once)
         for message in log_messages:
-            if message not in self.log_messages:
-                self.log_message(message.replace("[timestamp] ", ""))
+            self.log_message(message)
 
     def set_on_closing_callback(self, callback):
         """Set callback for window closing"""
@@ -123,4 +136,4 @@ class GUIInterface:
 
     def get_log_messages(self):
         """Get current log messages"""
-        return self.log_messages.copy()
\ No newline at end of file
+        return list(self.log_messages)
\ No newline at end of file
@@ -1,12 +1,13 @@
 import cv2 as cv
-import copy
 import time
+import queue
+import threading
 from collections import deque
 
 from .robot_controller import RobotController
 from .gesture_detector import GestureDetector
 from .gui_interface import GUIInterface
-from .fsm_controller import FSMController, FSMState
+from .fsm_controller import FSMController, FSMState, StaticGesture, DynamicGesture
 
 class HandGestureApp:
     def __init__(self, args):
@@ -18,114 +19,211 @@ class HandGestureApp:
         self.gui = GUIInterface()
         self.fsm_controller = FSMController()
         
+        # Classifier ids mapped to the FSM's gesture codes
+        self._static_gestures = {
+            self.gesture_detector.open_id: StaticGesture.OPEN,
+            self.gesture_detector.close_id: StaticGesture.CLOSE,
+        }
+        self._dynamic_gestures = {
+            self.gesture_detector.cw_id: DynamicGesture.CW,
+            self.gesture_detector.ccw_id: DynamicGesture.CCW,
+        }
+        
         # Camera setup
         self.cap = cv.VideoCapture(args.device)
         self.cap.set(cv.CAP_PROP_FRAME_WIDTH, args.width)
         self.cap.set(cv.CAP_PROP_FRAME_HEIGHT, args.height)
+        self.cap.set(cv.CAP_PROP_BUFFERSIZE, 1)
+        
+        # The camera may not honour the requested size, so use the negotiated one
+        self._w = int(self.cap.get(cv.CAP_PROP_FRAME_WIDTH)) or args.width
+        self._h = int(self.cap.get(cv.CAP_PROP_FRAME_HEIGHT)) or args.height
+        self.gesture_detector.set_frame_size(self._w, self._h)
+        
+        # 1-slot queues between capture, inference and Tk threads; stale items are dropped
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._result_queue = queue.Queue(maxsize=1)
+        self._stop_event = threading.Event()
         
         # History buffers
-        self.history_length = 16
+        self.history_length = self.gesture_detector.history_length
         self.point_history = deque(maxlen=self.history_length)
-        self.finger_gesture_history = deque(maxlen=self.history_length)
+
+        # Gesture inference runs on every Nth frame; hands are reused in between
+        self._frame_skip = 2
+        self._frame_idx = 0
+        self._hands = []
         
         # Connect GUI callbacks
         self.gui.set_on_closing_callback(self.on_closing)
         
-        # Start the main loop
+        # Latest processed frame and gestures, shown by the GUI tick
+        self._gui_interval_ms = 33
+        self._latest_debug_image = None
+        self._current_static_label = ""
+        self._current_dynamic_gesture = DynamicGesture.NONE
+        
+        # Start the capture and inference threads (MediaPipe stays confined to the latter)
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._inference_thread = threading.Thread(target=self._infer_loop, daemon=True)
+        self._capture_thread.start()
+        self._inference_thread.start()
+        
+        # Start the main loops
         self.gui.log_message("Aplicação iniciada. Aguardando gestos.")
-        self.update_frame()
+        self._result_tick()
+        self._gui_tick()
+
+    def _infer_loop(self):
+        """Inference thread: run detection and drawing on the latest frame"""
+        while not self._stop_event.is_set():
+            try:
+                image = self._frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            self._put_latest(self._result_queue, self._process_frame(image))
 
-    def update_frame(self):
-        """Main processing loop"""
+    def _process_frame(self, image):
+        """Detect gestures and draw the debug image for one camera frame"""
         fps = self.gesture_detector.cvFpsCalc.get()
+        # Single color conversion per frame: MediaPipe, drawing and GUI all use RGB
+        # (overlay colors are the same in BGR and RGB)
+        image = cv.cvtColor(cv.flip(image, 1), cv.COLOR_BGR2RGB)
+        debug_image = image
+        
+        # Process gestures on every Nth frame, reuse the last result otherwise
+        if self._frame_idx % self._frame_skip == 0:
+            self._hands = self._detect_gestures(image)
+        self._frame_idx += 1
 
-        ret, image = self.cap.read()
-        if not ret:
-            self.gui.root.after(10, self.update_frame)
-            return
-            
-        image = cv.flip(image, 1)
-        debug_image = copy.deepcopy(image)
+        current_static_gesture, current_dynamic_gesture = StaticGesture.NONE, DynamicGesture.NONE
+        current_static_label = ""
+        for hand in self._hands:
+            current_static_gesture = hand['static_gesture']
+            current_dynamic_gesture = hand['dynamic_gesture']
+            current_static_label = hand['static_label']
+
+            # Draw visualization
+            debug_image = self.gesture_detector.draw_landmarks(debug_image, hand['landmark_list'])
+            debug_image = self.gesture_detector.draw_info_text(
+                debug_image, hand['brect'], hand['handedness'],
+                current_static_label, hand['dynamic_label']
+            )
+        
+        # Draw finger movement and video FPS
+        debug_image = self.gesture_detector.draw_point_history(debug_image, self.point_history)
+        debug_image = self.gesture_detector.draw_info(debug_image, int(fps))
+        
+        return debug_image, current_static_gesture, current_dynamic_gesture, current_static_label
+
+    def _result_tick(self):
+        """Result loop: feed the latest inference result to the FSM"""
+        try:
+            debug_image, static_gesture, dynamic_gesture, static_label = self._result_queue.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            # Update FSM
+            self.fsm_controller.update(
+                static_gesture, 
+                dynamic_gesture, 
+                self.robot_controller
+            )
+
+            self._latest_debug_image = debug_image
+            self._current_static_label = static_label
+            self._current_dynamic_gesture = dynamic_gesture
         
-        # Process gestures
+        # Continue loop
+        self.gui.root.after(1, self._result_tick)
+
+    def _gui_tick(self):
+        """Display loop: show the latest processed frame and FSM status"""
+        if self._latest_debug_image is not None:
+            pending_selection = self.fsm_controller.pending_selection
+            self.gui.update_display(
+                self._latest_debug_image,
+                self.fsm_controller.state.name,
+                self._current_static_label,
+                self._current_dynamic_gesture.name if self._current_dynamic_gesture else "",
+                pending_selection.name if pending_selection else None,
+                self.fsm_controller.get_log_messages()
+            )
+            self._latest_debug_image = None
+        
+        # Continue loop
+        self.gui.root.after(self._gui_interval_ms, self._gui_tick)
+
+    def _capture_loop(self):
+        """Capture thread: continuously read the camera, keeping only the latest frame"""
+        while not self._stop_event.is_set():
+            ret, image = self.cap.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+            self._put_latest(self._frame_queue, image)
+
+    @staticmethod
+    def _put_latest(slot, item):
+        """Put item into a 1-slot queue, replacing any item not yet consumed"""
+        try:
+            slot.get_nowait()
+        except queue.Empty:
+            pass
+        slot.put_nowait(item)
+
+    def _detect_gestures(self, image):
+        """Detect hands and classify their static and dynamic gestures"""
         results = self.gesture_detector.process_frame(image)
-        current_static_gesture, current_dynamic_gesture = "", ""
+        hands = []
         
         if results.multi_hand_landmarks:
             for hand_landmarks, handedness in zip(results.multi_hand_landmarks, 
                                                 results.multi_handedness):
                 # Process hand landmarks
-                landmark_list = self.gesture_detector.calc_landmark_list(debug_image, hand_landmarks)
-                brect = self.gesture_detector.calc_bounding_rect(debug_image, hand_landmarks)
+                landmark_list, brect = self.gesture_detector.calc_landmarks_and_rect(hand_landmarks)
                 
                 # Classify gestures
                 hand_sign_id = self.gesture_detector.classify_static_gesture(landmark_list)
                 
                 # Update point history
-                if hand_sign_id == 2:  # Pointing gesture
-                    self.point_history.append(landmark_list[8])
+                if hand_sign_id == self.gesture_detector.pointer_id:
+                    self.point_history.append(landmark_list[8].tolist())
                 else:
                     self.point_history.append([0, 0])
                 
                 # Classify dynamic gesture
-                finger_gesture_id = self.gesture_detector.classify_dynamic_gesture(
-                    debug_image, self.point_history, self.history_length
-                )
-                self.finger_gesture_history.append(finger_gesture_id)
+                finger_gesture_id = self.gesture_detector.classify_dynamic_gesture(self.point_history)
+                self.gesture_detector.update_finger_gesture_history(finger_gesture_id)
                 
-                # Get gesture labels
-                current_static_gesture = self.gesture_detector.get_static_gesture_label(hand_sign_id)
-                dynamic_label = self.gesture_detector.get_dynamic_gesture_label(self.finger_gesture_history)
-                
-                if "Counter" in dynamic_label:
-                    current_dynamic_gesture = 'CCW'
-                elif "Clockwise" in dynamic_label:
-                    current_dynamic_gesture = 'CW'
-
-                if "Close" in current_static_gesture: 
-                    current_static_gesture = 'Close'
-                elif "Open" in current_static_gesture: 
-                    current_static_gesture = 'Open'
+                # Get gesture codes and labels
+                most_common_fg_id = self.gesture_detector.get_dynamic_gesture_id()
+                static_gesture = self._static_gestures.get(hand_sign_id, StaticGesture.NONE)
+                dynamic_gesture = self._dynamic_gestures.get(most_common_fg_id, DynamicGesture.NONE)
+                static_label = self.gesture_detector.get_static_gesture_label(hand_sign_id)
+                dynamic_label = self.gesture_detector.get_dynamic_gesture_label(most_common_fg_id)
                 
-                # Draw visualization
-                debug_image = self.gesture_detector.draw_landmarks(debug_image, landmark_list)
-                debug_image = self.gesture_detector.draw_info_text(
-                    debug_image, brect, handedness, current_static_gesture, dynamic_label
-                )
+                hands.append({
+                    'landmark_list': landmark_list,
+                    'brect': brect,
+                    'handedness': handedness,
+                    'static_gesture': static_gesture,
+                    'static_label': static_label,
+                    'dynamic_gesture': dynamic_gesture,
+                    'dynamic_label': dynamic_label
+                })
         else:
             self.point_history.append([0, 0])
-        
-        # Draw finger movement and video FPS
-        debug_image = self.gesture_detector.draw_point_history(debug_image, self.point_history)
-        debug_image = self.gesture_detector.draw_info(debug_image, int(fps))
-        
-        # Update FSM
-        self.fsm_controller.update(
-            current_static_gesture, 
-            current_dynamic_gesture, 
-            self.robot_controller
-        )
-
-        # Convert to RGB
-        debug_image_rgb = cv.cvtColor(debug_image, cv.COLOR_BGR2RGB)
-        
-        # Update GUI
-        self.gui.update_display(
-            debug_image_rgb,
-            self.fsm_controller.state.name,
-            current_static_gesture,
-            current_dynamic_gesture,
-            self.fsm_controller.pending_selection,
-            self.fsm_controller.get_log_messages()
-        )
-        
-        # Continue loop
-        self.gui.root.after(10, self.update_frame)
+            
+        return hands
 
     def on_closing(self):
         """Cleanup resources"""
         self.gui.log_message("Fechando a aplicação...")
         self.robot_controller.cleanup()
+        self._stop_event.set()
+        self._capture_thread.join(timeout=1.0)
+        self._inference_thread.join(timeout=1.0)
         self.cap.release()
         self.gui.cleanup()
 
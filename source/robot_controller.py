@@ -1,204 +1,584 @@
+import os
 import time
 import logging
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 
-try:
-    import rtde_receive
-    import rtde_control
-    import rtde_io
-    import dashboard_client
-    RTDE_AVAILABLE = True
-except ImportError:
-    RTDE_AVAILABLE = False
-    print("RTDE library not available. Using simulation mode.")
+from .dashboard_pipeline import DashboardPipeline
+
+logger = logging.getLogger(__name__)
+
+# Connected interfaces shared by controllers for the same (host, frequency):
+# key -> [(rtde_io, rtde_r, rtde_c, rtde_dash), reference count, _OutputState]
+_RTDE_POOL = {}
+_RTDE_POOL_LOCK = threading.Lock()
+
+
+class _OutputState:
+    """Write lock and output shadow shared by all controllers using one RTDEIOInterface"""
+    def __init__(self):
+        # IO writes may come from pulse threads as well as the callers'
+        self.lock = threading.Lock()
+        # Last value written to each output as bitmasks (standard 0-7 and configurable
+        # 8-15, tool 0-1), with the bits written so far; unchanged values are not rewritten
+        self.do_shadow = self.do_known = 0
+        self.tool_do_shadow = self.tool_do_known = 0
+
+
+def _rtde_guard(default, msg, key, gated=True):
+    """Log exceptions raised by an RTDE call with msg and return default instead.
+
+    Health is tracked per key ('io', 'receive', 'status' or 'control'). After
+    an error, gated calls return default without touching RTDE until that
+    key's backoff has elapsed; ungated calls (safety writes) always run.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if gated and self._backed_off(key):
+                return default
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception as e:
+                logger.warning(msg, e)
+                self._mark_unhealthy(key)
+                return default
+            if self._unhealthy_until[key]:
+                self._mark_healthy(key)
+            return result
+        return wrapper
+    return decorator
+
+# ur_rtde modules, imported by the first connect() (None until checked)
+RTDE_AVAILABLE = None
+rtde_receive = rtde_control = rtde_io = None
+
+
+def _ensure_rtde() -> bool:
+    """Import the ur_rtde modules once and report whether they are available"""
+    global RTDE_AVAILABLE, rtde_receive, rtde_control, rtde_io
+    if RTDE_AVAILABLE is None:
+        try:
+            import rtde_receive
+            import rtde_control
+            import rtde_io
+            RTDE_AVAILABLE = True
+        except ImportError:
+            RTDE_AVAILABLE = False
+            logger.warning("RTDE library not available. Using simulation mode.")
+    return RTDE_AVAILABLE
+
+def _set_realtime_priority():
+    """Give the calling thread SCHED_FIFO priority where the OS permits it"""
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(80))
+    except (AttributeError, OSError):
+        pass
+
 
 class RobotController:
-    def __init__(self, host: str = '192.168.0.160', port: int = 30004, frequency: int = 10):
+    # RTDE output recipe: the fields read by get_robot_status and get_program_finished
+    RECEIVE_VARIABLES = [
+        'safety_status_bits',
+        'robot_mode',
+        'runtime_state',
+        'actual_q',
+        'actual_TCP_pose',
+        'actual_digital_input_bits',
+        'actual_digital_output_bits',
+    ]
+
+    # Program started on the robot through the Dashboard server; the Dashboard is only
+    # used to start and stop it, runtime control goes over RTDE digital outputs
+    PROGRAM = "Futurecom/main.urp"
+
+    # Public methods bound per instance to _real_<name> or _sim_<name> by _bind_mode()
+    _MODE_METHODS = (
+        'pulse_execute',
+        'set_program_selection',
+        'set_enabled',
+        'get_program_finished',
+        'get_robot_status',
+        'send_move_command',
+        'stop_robot',
+    )
+
+    # Final part of a pulse that is busy-waited, as sleep can overshoot by about a millisecond
+    _PULSE_SPIN_S = 0.002
+    # Error backoff bounds and the heartbeat probe period, in seconds
+    _MIN_BACKOFF_S = 0.1
+    _MAX_BACKOFF_S = 5.0
+    _HEARTBEAT_INTERVAL_S = 0.5
+    # Health is tracked separately for each interface, and for the status snapshot
+    # read, so a failing status getter does not hold back the DO7 read
+    _HEALTH_KEYS = ('io', 'receive', 'status', 'control')
+
+    def __init__(self, host: str = '192.168.0.160', port: int = 30004, frequency: int = 10,
+                 rx_cpu: Optional[int] = None):
         self.host = host
         self.port = port
         self.frequency = frequency
+        self.rx_cpu = rx_cpu            # CPU the receive thread is pinned to, if any
         self.rtde_io = None             # IO interface
         self.rtde_c = None              # Control interface
         self.rtde_r = None              # Receive interface
-        self.dashboard_client = None    # Dashboard interface
+        self.rtde_dash = None           # Dashboard interface
         self.connected = False
-        self.simulation_mode = not RTDE_AVAILABLE
+        self.simulation_mode = False    # Set by connect() if RTDE is not installed
+        
+        # Output lock and shadow, shared with pooled controllers once connected
+        self._outputs = _OutputState()
+        self._pooled = False            # Holds a reference to a _RTDE_POOL entry
+        self._pulse_thread = None
+        
+        # When the last DO6 pulse ended (inf while one is active); DO7 is only trusted
+        # once it has been read after that
+        self._pulse_released_at = float('-inf')
+        
+        # Set once PROGRAM is known to be loaded and playing
+        self._program_started = False
+        
+        # Latest status snapshot, replaced (never modified) by the receive thread and
+        # cleared when a read fails; snapshots older than two RTDE cycles are not used,
+        # which leaves one cycle of slack for the read itself and scheduling jitter
+        self._latest_status = None
+        self._status_max_age = 2.0 / frequency
+        
+        # Calls on an interface are skipped until its _unhealthy_until after an error
+        self._unhealthy_until = dict.fromkeys(self._HEALTH_KEYS, 0.0)
+        self._backoff = dict.fromkeys(self._HEALTH_KEYS, self._MIN_BACKOFF_S)
+        
+        # Stops the heartbeat and receive threads of the current connection
+        self._stop_threads = None
         
         self.connect()
 
     def connect(self) -> bool:
         """Connect to the robot using RTDE"""
+        connected = self._connect()
+        self._bind_mode()
+        if self.connected and not self.simulation_mode:
+            self._start_threads()
+        return connected
+
+    def _connect(self) -> bool:
+        """Open (or reuse) the RTDE and Dashboard connections"""
+        if not _ensure_rtde():
+            self.simulation_mode = True
         if self.simulation_mode:
-            print("SIMULATION MODE: Robot controller initialized in simulation")
+            logger.info("SIMULATION MODE: Robot controller initialized in simulation")
             self.connected = True
             return True
             
+        # Already holding pooled interfaces
+        if self._pooled:
+            self.connected = True
+            return True
+        
+        # Reuse the interfaces (and output state) of another controller for the same robot
+        key = (self.host, self.frequency)
+        with _RTDE_POOL_LOCK:
+            entry = _RTDE_POOL.get(key)
+            if entry is not None:
+                self.rtde_io, self.rtde_r, self.rtde_c, self.rtde_dash = entry[0]
+                entry[1] += 1
+                self._outputs = entry[2]
+                self._pooled = True
+                self.connected = True
+                logger.info("RTDE Connected to %s (shared)", self.host)
+                return True
+            
+        futures = ()
         try:
-            # Create RTDE interfaces
-            self.rtde_io = rtde_io.RTDEIOInterface(self.host)
-            self.rtde_r = rtde_receive.RTDEReceiveInterface(self.host, frequency=self.frequency)
-            self.rtde_c = rtde_control.RTDEControlInterface(self.host, frequency=self.frequency)
-            self.rtde_dash = dashboard_client.DashboardClient(hostname=self.host, verbose=True)
+            # Create RTDE interfaces, with their handshakes overlapping (ur_rtde
+            # connects them with TCP_NODELAY and does not expose the sockets to Python)
+            self.rtde_dash = DashboardPipeline(self.host)
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                f_io = executor.submit(rtde_io.RTDEIOInterface, self.host)
+                f_r = executor.submit(rtde_receive.RTDEReceiveInterface, self.host, frequency=self.frequency,
+                                      variables=self.RECEIVE_VARIABLES)
+                f_c = executor.submit(rtde_control.RTDEControlInterface, self.host, frequency=self.frequency)
+                f_dash = executor.submit(self.rtde_dash.connect)
+                futures = (f_io, f_r, f_c)
+                self.rtde_io, self.rtde_r = f_io.result(), f_r.result()
+                self.rtde_c = f_c.result()
+                f_dash.result()
 
             # Test connection
-            print(f"RTDE Connected to {self.host}")
+            logger.info("RTDE Connected to %s", self.host)
 
-            # Connect dashboard interface
-            self.rtde_dash.connect()
+            # Output state on a new connection is unknown
+            self._outputs = _OutputState()
 
-            # Send start program command
-            self.rtde_dash.loadURP("Futurecom/main.urp")
-            self.rtde_dash.play()
+            # Send start program command, unless it is already running
+            self._start_program()
 
             # Set initial digital outputs to False
             self._set_all_outputs_false()
             
             self.connected = True
+            with _RTDE_POOL_LOCK:
+                _RTDE_POOL[key] = [(self.rtde_io, self.rtde_r, self.rtde_c, self.rtde_dash), 1, self._outputs]
+            self._pooled = True
 
             return True
             
         except Exception as e:
-            print(f"RTDE Connection failed: {e}")
+            logger.warning("RTDE Connection failed: %s", e)
+            # Close whatever was opened before the failure
+            opened = [future.result() for future in futures if future.exception() is None]
+            self._disconnect_interfaces(opened + [self.rtde_dash])
+            self.rtde_io = self.rtde_r = self.rtde_c = self.rtde_dash = None
             self.connected = False
             self.simulation_mode = True
             return False
 
+    def _disconnect_interfaces(self, interfaces):
+        """Disconnect each interface, logging errors instead of raising them"""
+        for interface in interfaces:
+            try:
+                interface.disconnect()
+            except Exception as e:
+                logger.warning("Error disconnecting %s: %s", type(interface).__name__, e)
+
+    def _start_program(self):
+        """Load and play PROGRAM, skipping the steps already done on the robot"""
+        if self._program_started:
+            return
+        loaded, state = self.rtde_dash.send("get loaded program", "programState")
+        
+        commands = []
+        if not loaded.endswith(self.PROGRAM):
+            commands.append("load " + self.PROGRAM)
+        if commands or not state.startswith("PLAYING"):
+            commands.append("play")
+        # One command at a time, so play is never sent after a failed load
+        for command in commands:
+            reply, = self.rtde_dash.send(command)
+            if not reply.startswith(("Loading program", "Starting program")):
+                raise RuntimeError(f"Dashboard '{command}' failed: {reply}")
+        self._program_started = True
+
+    @_rtde_guard(None, "Error setting initial outputs: %s", 'io', gated=False)
     def _set_all_outputs_false(self):
         """Set all digital outputs to False"""
         if self.connected and not self.simulation_mode:
-            try:
-                # Standard digital outputs (0-7)
-                for i in range(8):
-                    self.rtde_io.setStandardDigitalOut(i, False)
-                # Configurable digital outputs (8-15)  
-                for i in range(8, 16):
-                    self.rtde_io.setConfigurableDigitalOut(i, False)
-                # Tool digital outputs (0-1)
-                for i in range(2):
-                    self.rtde_io.setToolDigitalOut(i, False)
-            except Exception as e:
-                print(f"Error setting initial outputs: {e}")
+            with self._outputs.lock:
+                self._write_all_outputs_false()
+
+    def _write_all_outputs_false(self):
+        """Write False to every digital output not already False (caller holds the IO lock)"""
+        # ur_rtde's RTDEIOInterface has no mask setters, so each output is its own write
+        # Outputs that are unknown or True
+        state = self._outputs
+        outputs = ~state.do_known | state.do_shadow
+        tool_outputs = ~state.tool_do_known | state.tool_do_shadow
+        io = self.rtde_io
+        # Standard digital outputs (0-7)
+        set_standard = io.setStandardDigitalOut
+        for i in range(8):
+            if outputs >> i & 1:
+                set_standard(i, False)
+        # Configurable digital outputs (8-15)  
+        set_configurable = io.setConfigurableDigitalOut
+        for i in range(8, 16):
+            if outputs >> i & 1:
+                set_configurable(i, False)
+        # Tool digital outputs (0-1)
+        set_tool = io.setToolDigitalOut
+        for i in range(2):
+            if tool_outputs >> i & 1:
+                set_tool(i, False)
+        
+        state.do_shadow, state.do_known = 0, 0xFFFF
+        state.tool_do_shadow, state.tool_do_known = 0, 0x03
+
+    def _write_do(self, bit: int, value: bool):
+        """Write a standard digital output unless it already holds value"""
+        bit_mask = 1 << bit
+        state = self._outputs
+        with state.lock:
+            if state.do_known & bit_mask and bool(state.do_shadow & bit_mask) == value:
+                return
+            # A failed write may still have reached the robot
+            state.do_known &= ~bit_mask
+            self.rtde_io.setStandardDigitalOut(bit, value)
+            state.do_shadow = state.do_shadow & ~bit_mask | (bit_mask if value else 0)
+            state.do_known |= bit_mask
 
-    def pulse_execute(self, pulse_time: float = 0.50) -> bool:
-        """Pulse digital output to execute program"""
+    def _reconcile_outputs(self, actual: int):
+        """Forget shadowed outputs that the robot reports with another value.
+
+        Outputs can change outside this process (the program writes DO7, the
+        controller may reset outputs when a program stops), so the next write
+        to such an output always goes out.
+        """
+        # actual_digital_output_bits: standard 0-7, configurable 8-15, tool 16-17
+        state = self._outputs
+        with state.lock:
+            state.do_known &= ~(state.do_shadow ^ actual)
+            state.tool_do_known &= ~(state.tool_do_shadow ^ actual >> 16)
+
+    @_rtde_guard(False, "Error pulsing DO6: %s", 'io')
+    def _real_pulse_execute(self, pulse_time: float = 0.50, on_release=None) -> bool:
+        """Pulse digital output to execute program.
+
+        Returns once DO6 is set; a pulse thread clears it after pulse_time and
+        then calls on_release, if given.
+        """
+        # Set DO6 to True; DO7 stays trusted if the write fails
+        released_at, self._pulse_released_at = self._pulse_released_at, float('inf')
         try:
-            if self.connected and not self.simulation_mode:
-                # Set DO6 to True
-                self.rtde_io.setStandardDigitalOut(6, True)
-                time.sleep(pulse_time)
-                # Set DO6 to False
-                self.rtde_io.setStandardDigitalOut(6, False)
-                return True
-            else:
-                print(f"SIMULATION: Pulso DO[6] por {pulse_time}s")
-                return True
-                
-        except Exception as e:
-            print(f"Error pulsing DO6: {e}")
-            return False
+            self._write_do(6, True)
+        except Exception:
+            self._pulse_released_at = released_at
+            raise
+        # Set DO6 to False from the pulse thread
+        self._start_pulse(pulse_time, on_release)
+        return True
+
+    def _sim_pulse_execute(self, pulse_time: float = 0.50, on_release=None) -> bool:
+        """Simulated pulse_execute"""
+        logger.info("SIMULATION: Pulso DO[6] por %ss", pulse_time)
+        if on_release is not None:
+            on_release()
+        return True
+
+    def _start_pulse(self, pulse_time, on_release):
+        """Schedule the falling edge of the DO6 pulse"""
+        deadline = time.monotonic() + pulse_time
+        self._pulse_thread = threading.Thread(target=self._release_pulse, args=(deadline, on_release),
+                                              daemon=True)
+        self._pulse_thread.start()
 
-    def set_program_selection(self, is_prog2: bool) -> bool:
-        """Set program selection output (DO5)"""
+    def _release_pulse(self, deadline, on_release):
+        """Pulse thread: wait until deadline, then end the DO6 pulse"""
+        _set_realtime_priority()
+        slack = deadline - time.monotonic() - self._PULSE_SPIN_S
+        if slack > 0:
+            time.sleep(slack)
+        while time.monotonic() < deadline:
+            pass
+        
         try:
-            if self.connected and not self.simulation_mode:
-                self.rtde_io.setStandardDigitalOut(5, is_prog2)
-                return True
-            else:
-                print(f"SIMULATION: Set DO5 to {is_prog2}")
-                return True
-                
+            self._write_do(6, False)
         except Exception as e:
-            print(f"Error setting DO5: {e}")
+            logger.warning("Error pulsing DO6: %s", e)
+        self._pulse_released_at = time.monotonic()
+        if on_release is not None:
+            on_release()
+
+    def await_pulse(self):
+        """Block until a pending DO6 pulse has ended"""
+        if self._pulse_thread is not None:
+            self._pulse_thread.join()
+
+    @_rtde_guard(False, "Error setting DO5: %s", 'io', gated=False)
+    def _real_set_program_selection(self, is_prog2: bool) -> bool:
+        """Set program selection output (DO5); clearing it ignores the backoff"""
+        if is_prog2 and self._backed_off('io'):
             return False
+        self._write_do(5, is_prog2)
+        return True
 
-    def set_enabled(self, enabled: bool) -> bool:
-        """Set enabled state output (DO4)"""
-        try:
-            if self.connected and not self.simulation_mode:
-                self.rtde_io.setStandardDigitalOut(4, enabled)
-                return True
-            else:
-                print(f"SIMULATION: Set DO4 to {enabled}")
-                return True
-                
-        except Exception as e:
-            print(f"Error setting DO4: {e}")
+    def _sim_set_program_selection(self, is_prog2: bool) -> bool:
+        """Simulated set_program_selection"""
+        logger.info("SIMULATION: Set DO5 to %s", is_prog2)
+        return True
+
+    @_rtde_guard(False, "Error setting DO4: %s", 'io', gated=False)
+    def _real_set_enabled(self, enabled: bool) -> bool:
+        """Set enabled state output (DO4); disabling ignores the backoff"""
+        if enabled and self._backed_off('io'):
             return False
+        self._write_do(4, enabled)
+        return True
 
-    def get_program_finished(self) -> bool:
-        """Check if program has finished (DI7)"""
-        try:
-            if self.connected and not self.simulation_mode:
-                return self.rtde_r.getDigitalOutState(7)
-            else:
-                # In simulation, return finished after a delay
-                return True
-                
-        except Exception as e:
-            print(f"Error reading DI7: {e}")
+    def _sim_set_enabled(self, enabled: bool) -> bool:
+        """Simulated set_enabled"""
+        logger.info("SIMULATION: Set DO4 to %s", enabled)
+        return True
+
+    @_rtde_guard(False, "Error reading DI7: %s", 'receive')
+    def _real_get_program_finished(self) -> bool:
+        """Check if program has finished (DI7).
+
+        Reports False while the execute pulse is active and until DO7 has been
+        read after its falling edge, as DO7 may still be set from the last run.
+        """
+        released_at = self._pulse_released_at
+        status = self._fresh_status()
+        if status is None:
+            if time.monotonic() - released_at < self._status_max_age:
+                return False
+            return self.rtde_r.getDigitalOutState(7)
+        if status['timestamp'] <= released_at:
             return False
+        return bool(status['digital_outputs'] >> 7 & 1)
 
-    def get_robot_status(self) -> Optional[dict]:
-        """Get comprehensive robot status"""
-        if not self.connected or self.simulation_mode:
-            return {
-                'simulation': True,
-                'connected': False,
-                'safety_status': 'SIMULATION',
-                'robot_mode': 'SIMULATION',
-                'program_running': False
-            }
-            
-        try:
-            return {
-                'simulation': False,
-                'connected': True,
-                'safety_status': self.rtde_r.getSafetyStatusBits(),
-                'robot_mode': self.rtde_r.getRobotMode(),
-                'program_running': self.rtde_r.isProgramRunning(),
-                'actual_q': self.rtde_r.getActualQ(),  # Joint positions
-                'actual_tcp_pose': self.rtde_r.getActualTCPPose(),  # TCP pose
-                'digital_inputs': self.rtde_r.getActualDigitalInputBits(),
-                'digital_outputs': self.rtde_r.getActualDigitalOutputBits()
-            }
-        except Exception as e:
-            print(f"Error getting robot status: {e}")
+    def _sim_get_program_finished(self) -> bool:
+        """Simulated get_program_finished"""
+        # In simulation, return finished after a delay
+        return True
+
+    def _real_get_robot_status(self) -> Optional[dict]:
+        """Get comprehensive robot status.
+
+        Returns the receive thread's latest snapshot, which is shared and
+        must not be modified.
+        """
+        status = self._fresh_status()
+        if status is None:
+            status = self._read_status()
+        return status
+
+    def _fresh_status(self) -> Optional[dict]:
+        """Latest status snapshot, or None if there is none from the last two RTDE cycles"""
+        status = self._latest_status
+        if status is None or time.monotonic() - status['timestamp'] > self._status_max_age:
             return None
+        return status
+
+    @_rtde_guard(None, "Error getting robot status: %s", 'status')
+    def _read_status(self) -> Optional[dict]:
+        """Read a new status snapshot from the receive interface"""
+        # Getters read the latest packet of the recipe subscribed in connect()
+        r = self.rtde_r
+        return {
+            'timestamp': time.monotonic(),
+            'simulation': False,
+            'connected': True,
+            'safety_status': r.getSafetyStatusBits(),
+            'robot_mode': r.getRobotMode(),
+            'program_running': r.isProgramRunning(),
+            'actual_q': r.getActualQ(),  # Joint positions
+            'actual_tcp_pose': r.getActualTCPPose(),  # TCP pose
+            'digital_inputs': r.getActualDigitalInputBits(),
+            'digital_outputs': r.getActualDigitalOutputBits()
+        }
+
+    def _receive(self, stop):
+        """Receive thread: refresh the status snapshot once per RTDE cycle"""
+        if self.rx_cpu is not None:
+            try:
+                os.sched_setaffinity(0, {self.rx_cpu})
+            except (AttributeError, OSError) as e:
+                logger.warning("Could not pin receive thread to CPU %s: %s", self.rx_cpu, e)
+        
+        period = 1.0 / self.frequency
+        next_read = time.monotonic()
+        while not stop.is_set():
+            status = self._latest_status = self._read_status()
+            if status is not None:
+                self._reconcile_outputs(status['digital_outputs'])
+            # After an overrun, resume from now instead of catching up with a burst of reads
+            next_read = max(next_read + period, time.monotonic())
+            stop.wait(max(0.0, next_read - time.monotonic()))
+
+    def _sim_get_robot_status(self) -> Optional[dict]:
+        """Simulated get_robot_status"""
+        return {
+            'simulation': True,
+            'connected': False,
+            'safety_status': 'SIMULATION',
+            'robot_mode': 'SIMULATION',
+            'program_running': False
+        }
 
-    def send_move_command(self, pose: list, velocity: float = 0.1, acceleration: float = 0.1) -> bool:
+    @_rtde_guard(False, "Error sending move command: %s", 'control')
+    def _real_send_move_command(self, pose: list, velocity: float = 0.1, acceleration: float = 0.1) -> bool:
         """Send movement command to robot (optional functionality)"""
+        # Move to specified pose (x, y, z, rx, ry, rz)
+        self.rtde_c.moveL(pose, velocity, acceleration)
+        return True
+
+    def _sim_send_move_command(self, pose: list, velocity: float = 0.1, acceleration: float = 0.1) -> bool:
+        """Simulated send_move_command (fails if the robot is just disconnected)"""
         if self.simulation_mode:
-            print(f"SIMULATION: Move to {pose}")
-            return True
-            
-        try:
-            if self.connected:
-                # Move to specified pose (x, y, z, rx, ry, rz)
-                self.rtde_c.moveL(pose, velocity, acceleration)
-                return True
-        except Exception as e:
-            print(f"Error sending move command: {e}")
-            
-        return False
+            logger.info("SIMULATION: Move to %s", pose)
+        return self.simulation_mode
 
-    def stop_robot(self) -> bool:
+    @_rtde_guard(False, "Error stopping robot: %s", 'control', gated=False)
+    def _real_stop_robot(self) -> bool:
         """Stop robot movement"""
-        if self.connected and not self.simulation_mode:
-            try:
-                self.rtde_c.stopL(10.0)  # Deceleration of 10 m/s²
-                return True
-            except Exception as e:
-                print(f"Error stopping robot: {e}")
+        self.rtde_c.stopL(10.0)  # Deceleration of 10 m/s²
+        return True
+
+    def _sim_stop_robot(self) -> bool:
+        """Simulated stop_robot"""
         return False
 
+    def _bind_mode(self):
+        """Bind the mode-dependent methods to their real or simulated implementation"""
+        prefix = '_real_' if self.connected and not self.simulation_mode else '_sim_'
+        for name in self._MODE_METHODS:
+            setattr(self, name, getattr(self, prefix + name))
+
+    def _backed_off(self, key: str) -> bool:
+        """Whether gated calls for key are being skipped after an error"""
+        until = self._unhealthy_until[key]
+        return bool(until) and time.monotonic() < until
+
+    def _mark_unhealthy(self, key: str):
+        """Skip gated calls for key for its current backoff, doubling it for the next error"""
+        backoff = self._backoff[key]
+        self._unhealthy_until[key] = time.monotonic() + backoff
+        self._backoff[key] = min(self._MAX_BACKOFF_S, backoff * 2)
+
+    def _mark_healthy(self, key: str):
+        """Resume calls for key and reset its backoff"""
+        self._unhealthy_until[key] = 0.0
+        self._backoff[key] = self._MIN_BACKOFF_S
+
+    def _start_threads(self):
+        """Start the heartbeat and receive threads for the current connection"""
+        if self._stop_threads is not None:
+            self._stop_threads.set()
+        self._latest_status = None
+        self._stop_threads = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(self._stop_threads,), daemon=True).start()
+        threading.Thread(target=self._receive, args=(self._stop_threads,), daemon=True).start()
+
+    def _heartbeat(self, stop):
+        """Heartbeat thread: end the receive and control backoffs once they report connected"""
+        # RTDEIOInterface has no connection check, so its backoff only ends by expiring;
+        # so does the status read's, as a failing getter leaves the interface connected
+        probes = (('receive', self.rtde_r), ('control', self.rtde_c))
+        while not stop.wait(self._HEARTBEAT_INTERVAL_S):
+            for interface, rtde in probes:
+                if not self._unhealthy_until[interface]:
+                    continue
+                try:
+                    healthy = rtde.isConnected()
+                except Exception:
+                    healthy = False
+                if healthy:
+                    self._mark_healthy(interface)
+
     def cleanup(self):
         """Cleanup robot connection"""
+        if self._stop_threads is not None:
+            self._stop_threads.set()
         try:
             if self.connected and not self.simulation_mode:
+                # Let a pending DO6 pulse finish
+                self.await_pulse()
+                
+                # Leave the program and connections to controllers still using them
+                if not self._release_pooled():
+                    return
+                
                 # Send stop program command
-                self.rtde_dash.stop()
+                try:
+                    self.rtde_dash.send("stop")
+                except Exception as e:
+                    logger.warning("Error stopping program: %s", e)
+                self._program_started = False
 
-                # Set all outputs to False before disconnecting
+                # Set all outputs to False before disconnecting, whatever was written before
+                self._outputs = _OutputState()
                 self._set_all_outputs_false()
                 
                 # Stop any movement
@@ -214,12 +594,29 @@ class RobotController:
                 if self.rtde_dash:
                     self.rtde_dash.disconnect()
                     
-                print("RTDE connection closed properly")
+                logger.info("RTDE connection closed properly")
                 
         except Exception as e:
-            print(f"Error during cleanup: {e}")
+            logger.warning("Error during cleanup: %s", e)
         finally:
             self.connected = False
+            self._bind_mode()
+
+    def _release_pooled(self) -> bool:
+        """Drop this controller's reference to the pooled interfaces, True if it was the last"""
+        if not self._pooled:
+            return True
+        self._pooled = False
+        with _RTDE_POOL_LOCK:
+            key = (self.host, self.frequency)
+            entry = _RTDE_POOL.get(key)
+            if entry is None:
+                return True
+            entry[1] -= 1
+            if entry[1] > 0:
+                return False
+            del _RTDE_POOL[key]
+            return True
 
     def is_connected(self) -> bool:
         """Check if robot is connected"""
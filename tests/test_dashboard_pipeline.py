@@ -0,0 +1,71 @@
+import socket
+import threading
+
+import pytest
+
+from source.dashboard_pipeline import DashboardPipeline
+
+WELCOME = b"Connected: Universal Robots Dashboard Server\n"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Local Dashboard server; call it with a handler run on the accepted connection"""
+    listener = socket.create_server(('127.0.0.1', 0))
+    monkeypatch.setattr(DashboardPipeline, 'PORT', listener.getsockname()[1])
+    threads = []
+
+    def serve(handler):
+        def run():
+            conn, _ = listener.accept()
+            with conn:
+                conn.sendall(WELCOME)
+                handler(conn)
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    yield serve
+    for thread in threads:
+        thread.join(timeout=2)
+    listener.close()
+
+
+def echo_commands(conn):
+    """Reply to each command line with 'reply: <command>' until the client closes"""
+    with conn.makefile('rb') as reader:
+        for line in reader:
+            conn.sendall(b"reply: " + line)
+
+
+def test_welcome_line_is_consumed(server):
+    server(echo_commands)
+    dash = DashboardPipeline('127.0.0.1')
+    dash.connect()
+    try:
+        assert dash.send("programState") == ["reply: programState"]
+    finally:
+        dash.disconnect()
+
+
+def test_batch_replies_come_back_in_order(server):
+    server(echo_commands)
+    dash = DashboardPipeline('127.0.0.1')
+    dash.connect()
+    try:
+        commands = ("get loaded program", "programState", "play")
+        assert dash.send(*commands) == ["reply: " + command for command in commands]
+        assert dash.send("stop") == ["reply: stop"]
+    finally:
+        dash.disconnect()
+
+
+def test_closed_connection_raises(server):
+    server(lambda conn: None)
+    dash = DashboardPipeline('127.0.0.1')
+    dash.connect()
+    try:
+        with pytest.raises(ConnectionError):
+            dash.send("programState")
+    finally:
+        dash.disconnect()
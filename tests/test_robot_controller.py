@@ -0,0 +1,202 @@
+import sys
+import time
+import types
+
+import pytest
+
+from source import robot_controller
+
+
+class FakeIO:
+    """RTDEIOInterface that records writes and can fail the next write to one output"""
+    instances = []
+
+    def __init__(self, host):
+        self.calls = []
+        self.fail_bit = None
+        self.connected = True
+        self.instances.append(self)
+
+    def setStandardDigitalOut(self, bit, value):
+        if bit == self.fail_bit:
+            self.fail_bit = None
+            raise RuntimeError("IO write failed")
+        self.calls.append(('standard', bit, value))
+
+    def setConfigurableDigitalOut(self, bit, value):
+        self.calls.append(('configurable', bit, value))
+
+    def setToolDigitalOut(self, bit, value):
+        self.calls.append(('tool', bit, value))
+
+    def disconnect(self):
+        self.connected = False
+
+
+class FakeReceive:
+    def __init__(self, host, frequency, variables):
+        self.outputs = 0
+
+    def isConnected(self):
+        return True
+
+    def getActualDigitalOutputBits(self):
+        return self.outputs
+
+    def getDigitalOutState(self, bit):
+        return bool(self.outputs >> bit & 1)
+
+    def __getattr__(self, name):
+        return lambda *args: 0
+
+    def disconnect(self):
+        pass
+
+
+class FakeControl:
+    def __init__(self, host, frequency):
+        self.stops = []
+
+    def isConnected(self):
+        return True
+
+    def stopL(self, deceleration):
+        self.stops.append(deceleration)
+
+    def disconnect(self):
+        pass
+
+
+class FakeDashboard:
+    """Dashboard client answering from a reply table and recording each batch sent"""
+    replies = {
+        'get loaded program': "Loaded program: /programs/" + robot_controller.RobotController.PROGRAM,
+        'programState': "PLAYING main.urp",
+    }
+    instances = []
+
+    def __init__(self, host):
+        self.sent = []
+        self.connected = False
+        self.instances.append(self)
+
+    def connect(self):
+        self.connected = True
+
+    def send(self, *commands):
+        self.sent.append(commands)
+        return [self.replies.get(command, "") for command in commands]
+
+    def disconnect(self):
+        self.connected = False
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    for name, attr, cls in (('rtde_io', 'RTDEIOInterface', FakeIO),
+                            ('rtde_receive', 'RTDEReceiveInterface', FakeReceive),
+                            ('rtde_control', 'RTDEControlInterface', FakeControl)):
+        module = types.ModuleType(name)
+        setattr(module, attr, cls)
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.setattr(robot_controller, 'RTDE_AVAILABLE', None)
+    monkeypatch.setattr(robot_controller, '_RTDE_POOL', {})
+    monkeypatch.setattr(robot_controller, 'DashboardPipeline', FakeDashboard)
+    monkeypatch.setattr(FakeDashboard, 'instances', [])
+    monkeypatch.setattr(FakeIO, 'instances', [])
+    controller = robot_controller.RobotController('robot')
+    yield controller
+    controller.cleanup()
+
+
+def test_safety_writes_skip_the_io_backoff(controller):
+    assert controller.is_connected()
+    io, control = controller.rtde_io, controller.rtde_c
+    assert controller.set_enabled(True)
+    io.fail_bit = 5
+    assert not controller.set_program_selection(True)
+    assert controller._backed_off('io')
+    io.calls.clear()
+
+    assert controller.set_enabled(False)
+    controller.cleanup()
+
+    assert io.calls[0] == ('standard', 4, False)
+    cleared = set(io.calls[1:])
+    assert cleared >= {('standard', bit, False) for bit in range(8)}
+    assert cleared >= {('configurable', bit, False) for bit in range(8, 16)}
+    assert cleared >= {('tool', bit, False) for bit in range(2)}
+    assert control.stops == [10.0]
+
+
+def test_io_backoff_grows_while_other_interfaces_are_healthy(controller):
+    controller._mark_unhealthy('io')
+    controller._mark_unhealthy('io')
+    assert controller.get_robot_status() is not None
+    assert controller._backed_off('io')
+    assert controller._backoff['io'] == 4 * controller._MIN_BACKOFF_S
+    assert not controller.set_enabled(True)
+
+
+def test_failed_load_does_not_play_and_closes_interfaces(controller, monkeypatch):
+    controller.cleanup()
+    monkeypatch.setattr(FakeDashboard, 'replies', {
+        'get loaded program': "Loaded program: /programs/other.urp",
+        'programState': "STOPPED other.urp",
+        'load ' + controller.PROGRAM: "File not found: " + controller.PROGRAM,
+    })
+    controller.simulation_mode = False
+
+    assert not controller.connect()
+
+    dash, io = FakeDashboard.instances[-1], FakeIO.instances[-1]
+    assert dash.sent == [('get loaded program', 'programState'), ('load ' + controller.PROGRAM,)]
+    assert not dash.connected
+    assert not io.connected
+    assert controller.simulation_mode and controller.rtde_io is None
+
+
+def test_failed_pulse_keeps_program_finished_readable(controller):
+    controller.rtde_r.outputs = 1 << 7
+    controller._latest_status = None
+    controller.rtde_io.fail_bit = 6
+
+    assert not controller.pulse_execute(0.2)
+    assert controller.get_program_finished()
+
+
+def wait_for_snapshot(controller):
+    """Wait until the receive thread has handled a snapshot read after this call"""
+    since = time.monotonic()
+    while (controller._latest_status or {}).get('timestamp', since) <= since:
+        time.sleep(0.005)
+    time.sleep(0.005)
+
+
+def test_output_changed_on_the_robot_is_rewritten(controller):
+    io = controller.rtde_io
+    controller.rtde_r.outputs = 1 << 4
+    wait_for_snapshot(controller)
+    assert controller.set_enabled(True)
+    wait_for_snapshot(controller)
+    assert controller.set_enabled(True)
+    assert io.calls.count(('standard', 4, True)) == 1
+
+    # DO4 cleared outside this process
+    controller.rtde_r.outputs = 0
+    wait_for_snapshot(controller)
+    assert controller.set_enabled(True)
+    assert io.calls.count(('standard', 4, True)) == 2
+
+
+def test_failing_status_getter_does_not_gate_program_finished(controller):
+    def fail():
+        raise RuntimeError("isProgramRunning failed")
+    controller.rtde_r.outputs = 1 << 7
+    controller.rtde_r.isProgramRunning = fail
+    time.sleep(0.005)
+    controller._latest_status = None
+    assert controller._read_status() is None
+    assert controller._backed_off('status')
+
+    assert all(controller.get_program_finished() for _ in range(100))
@@ -1,6 +1,38 @@
 #!/usr/bin/env python3
+import errno
 import socket
+import selectors
 import sys
+import time
+
+def probe_ports(robot_ip, ports, timeout=0.3):
+    """Connect to all ports at once, returning the connect error code per port"""
+    results = {port: errno.ETIMEDOUT for port in ports}
+    sel = selectors.DefaultSelector()
+    for port in ports:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        result = sock.connect_ex((robot_ip, port))
+        if result in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            sel.register(sock, selectors.EVENT_WRITE, port)
+        else:
+            results[port] = result
+            sock.close()
+    
+    deadline = time.monotonic() + timeout
+    while sel.get_map():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        for key, _ in sel.select(timeout=remaining):
+            results[key.data] = key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            sel.unregister(key.fileobj)
+            key.fileobj.close()
+    
+    for key in list(sel.get_map().values()):
+        key.fileobj.close()
+    sel.close()
+    return results
 
 def test_rtde_connection():
     print("=== RTDE Connection Test ===")
@@ -15,22 +47,23 @@ def test_rtde_connection():
         print("Install with: pip install ur-rtde")
         return False
     
-    # Testar conexão de rede com o robô
+    # Testar conexão de rede com o robô (Dashboard, primary e RTDE em paralelo)
     robot_ip = '192.168.0.160'
-    port = 30004
+    ports = (29999, 30001, 30004)
     
-    print(f"Testing connection to {robot_ip}:{port}")
+    print(f"Testing connection to {robot_ip}:{', '.join(map(str, ports))}")
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(3)
-        result = sock.connect_ex((robot_ip, port))
-        sock.close()
+        results = probe_ports(robot_ip, ports)
+        for port, result in results.items():
+            if result == 0:
+                print(f"  - Port {port}: connection successful")
+            else:
+                print(f"  - Port {port}: connection failed (error code: {result})")
         
-        if result == 0:
-            print("Network connection successful")
-        else:
-            print(f"Network connection failed (error code: {result})")
+        if any(results.values()):
+            print("Network connection failed")
             return False
+        print("Network connection successful")
     except Exception as e:
         print(f"Network test error: {e}")
         return False